@@ -1,21 +1,175 @@
+import heapq
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+try:
+    from numba import njit
+    JIT_AVAILABLE = True
+except ImportError:  # numba is optional; the kernels below then run as plain Python
+    JIT_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+LFU_AGING_INTERVAL = 256  # Halve every LFU access count after this many translations
+_NOT_EVICTABLE = np.iinfo(np.int64).max  # LFU count that keeps unused frames from being picked
+
+
+@njit(cache=True)
+def _next_free_frame(used_mask, next_free, highest_frame):
+    """Return the first unused frame at or after max(next_free, highest_frame + 1), or -1 if none."""
+    frame = max(next_free, highest_frame + 1)
+    while frame < 1024 and used_mask[frame]:
+        frame += 1
+    return frame if frame < 1024 else -1
+
+
+@njit(cache=True)
+def _lfu_victim(used_mask, access_count):
+    """Return the used frame with the lowest access count (frames 0,1 excluded), or -1 if none."""
+    # One argmin over all counts, with unused frames pushed out of reach; asarray wraps the
+    # interpreted path's memoryviews without copying, and argmin breaks ties by lowest frame
+    used = np.asarray(used_mask)[2:]
+    victim = np.argmin(np.where(used, np.asarray(access_count)[2:], _NOT_EVICTABLE))
+    return victim + 2 if used[victim] else -1
+
+
+@njit(cache=True)
+def _claim_frame(used_mask, access_count, next_free, highest_frame):
+    """Claim a frame for a page fault, evicting the LFU frame if none is free.
+
+    Returns (frame, next_free); frame is -1 if nothing could be claimed.
+    """
+    frame = _next_free_frame(used_mask, next_free, highest_frame)
+    if frame >= 0:
+        next_free = frame + 1
+    else:
+        frame = _lfu_victim(used_mask, access_count)
+        if frame < 0:
+            return -1, next_free
+        access_count[frame] = 0
+    used_mask[frame] = True
+    return frame, next_free
+
+
+@njit(cache=True)
+def _translate_batch(PM, DISK, vas, used_mask, access_count, next_free, highest_frame, translations,
+                     age_counts):
+    """Translate each VA in vas, servicing page faults along the way.
+
+    DISK is the disk flattened to one word array, block b at DISK[b*512:(b+1)*512]. With age_counts,
+    LFU counts are halved in place every LFU_AGING_INTERVAL translations; the interpreted caller
+    instead splits the stream at those points and ages the counts as one numpy op.
+    Returns (physical addresses with -1 for faults, updated next_free, updated translations).
+    """
+    pas = np.empty(vas.shape[0], dtype=np.int64)
+    # Software TLB for the segment table: the last segment whose PT was resident, with its ST entry
+    tlb_s, tlb_size, tlb_pt = -1, 0, 0
+    # Micro-TLB: page frame of the last (s, p) translated, since same-page runs are the common case
+    last_s, last_p, last_pf = -1, -1, 0
+    for i in range(vas.shape[0]):
+        va = vas[i]
+        pas[i] = -1
+        # Age LFU counts so frames that stop being used become evictable again
+        translations += 1
+        if age_counts and translations % LFU_AGING_INTERVAL == 0:
+            for frame in range(1024):
+                access_count[frame] >>= 1
+        # Extract s, p, w from VA (each 9 bits); p and w come out of pw, which is already masked
+        pw = va & 0x3FFFF       # Last 18 bits (p and w combined)
+        s = (va >> 18) & 0x1FF  # First 9 bits
+        p = pw >> 9             # Middle 9 bits
+        w = pw & 0x1FF          # Last 9 bits
+        s2 = s << 1             # ST entry for s: PM[s2] = size, PM[s2 + 1] = PT location
+
+        # Read the ST entry, skipping PM entirely when the segment is cached
+        if s == tlb_s:
+            size, pt_loc = tlb_size, tlb_pt
+        else:
+            size, pt_loc = PM[s2], PM[s2 + 1]
+
+        # Check if segment exists and if VA is within segment bounds
+        if size == 0 or pw >= size:
+            continue  # Segment fault or offset beyond segment size
+
+        # A negative PT location is the disk block of a non-resident PT
+        if pt_loc < 0:
+            last_s = -1  # Any fault may evict frames, so drop the micro-TLB entry
+            frame, next_free = _claim_frame(used_mask, access_count, next_free, highest_frame)
+            if frame < 0:
+                continue
+            # Copy the whole PT from its disk block into the frame in one slice
+            disk_block = -pt_loc  # pt_loc < 0 here, so negating is |pt_loc| without an abs() call
+            frame_base = frame << 9
+            PM[frame_base:frame_base + 512] = DISK[disk_block << 9:(disk_block << 9) + 512]
+            PM[s2 + 1] = frame  # Update ST to point to new PT frame
+            pt_loc = frame
+        tlb_s, tlb_size, tlb_pt = s, size, pt_loc  # Refill the TLB; a PT fault above changed the ST entry
+        access_count[pt_loc] += 1  # Access PT frame
+
+        # Get page frame from PT unless the micro-TLB has it; a negative value means the page is on disk
+        if s == last_s and p == last_p:
+            page_frame = last_pf
+        else:
+            pte = (pt_loc << 9) + p
+            page_frame = PM[pte]
+            if page_frame < 0:
+                last_s = -1  # Any fault may evict frames, so drop the micro-TLB entry
+                frame, next_free = _claim_frame(used_mask, access_count, next_free, highest_frame)
+                if frame < 0:
+                    continue
+                # Page contents are simulated, so only the PT entry needs updating
+                PM[pte] = frame
+                page_frame = frame
+            last_s, last_p, last_pf = s, p, page_frame
+        access_count[page_frame] += 1  # Access page frame
+
+        # Calculate final physical address
+        pas[i] = (page_frame << 9) + w
+    return pas, next_free, translations
+
+
 class VMManager:
-    def __init__(self):
-        self.PM = [0] * 524288  # Physical memory array
-        self.DISK = [[0] * 512 for _ in range(1024)]  # Disk array
+    def __init__(self, disk_file=None):
+        self.PM = np.zeros(524288, dtype=np.int32)  # Physical memory array
+        if disk_file is None:
+            self.DISK = np.zeros((1024, 512), dtype=np.int32)  # Disk array, one row per block
+        else:  # Back the disk with a file the OS pages in on demand instead of keeping it resident
+            self.DISK = np.memmap(disk_file, dtype=np.int32, mode='w+', shape=(1024, 512))
         self.segment_table = {}  # Dictionary to store segment table entries
         self.page_tables = {}    # Dictionary to store page tables
-        self.used_frames = {0, 1}  # Frames 0,1 reserved for ST (2 frames since each entry is 2 integers)
+        self.used_mask = np.zeros(1024, dtype=np.bool_)  # used_mask[f] is True if frame f is allocated
+        self.used_mask[:2] = True  # Frames 0,1 reserved for ST (2 frames since each entry is 2 integers)
         self.next_free_frame = 2  # Will be updated after initialization
         self.highest_frame = 1    # Track highest frame number seen
-        self.frame_access_count = {}  # For LFU: frame_number -> access count
+        self.frame_access_count = np.zeros(1024, dtype=np.int64)  # For LFU: access count per frame
+        self._lfu_heap = []  # For LFU: (access count, frame) min-heap, stale entries skipped lazily
+        self._lfu_heap_stale = True  # Counts changed without heap pushes; rebuild before next eviction
+        self._translations = 0  # Translations so far, drives LFU aging
         self.allocations = {}  # Maps starting physical address to (num_frames, [frame_numbers])
+        self._frame_to_alloc = {}  # Inverted index of allocations: frame_number -> starting physical address
+
+    def _first_free_frame(self, start):
+        """Return the first unused frame >= start, or 1024 if there is none."""
+        if start >= 1024:
+            return 1024
+        # argmin over a bool mask is the index of its first False, scanned in C
+        frame = start + int(np.argmin(self.used_mask[start:]))
+        return 1024 if self.used_mask[frame] else frame
 
     def get_next_free_frame(self):
-        """Find the next available free frame."""
-        frame = max(self.next_free_frame, self.highest_frame + 1)
-        while frame in self.used_frames:
-            frame += 1
-        self.used_frames.add(frame)
+        """Find and claim the next available free frame. Returns None if every frame is in use."""
+        frame = self._first_free_frame(max(self.next_free_frame, self.highest_frame + 1))
+        if frame >= 1024:
+            return None
+        self.used_mask[frame] = True
+        self._push_lfu(frame)
         self.next_free_frame = frame + 1
         return frame
 
@@ -23,42 +177,33 @@ class VMManager:
         """Initialize segment and page tables from input file."""
         try:
             with open(init_file, 'r') as file:
-                # Read segment table entries (Line 1: s1 z1 f1 s2 z2 f2 ... sn zn fn)
-                segment_line = file.readline().strip().split()
-                for i in range(0, len(segment_line), 3):
-                    s = int(segment_line[i])      # segment number
-                    z = int(segment_line[i + 1])  # segment size
-                    frame = int(segment_line[i + 2])  # frame/block number
-                    
-                    # Set segment size in ST: PM[2s] = z
-                    self.PM[2 * s] = z
-                    # Set PT location in ST: PM[2s+1] = frame
-                    self.PM[2 * s + 1] = frame
-                    
-                    if frame > 0:  # PT is in memory
-                        self.used_frames.add(frame)
-                        self.highest_frame = max(self.highest_frame, frame)
-
-                # Read page table entries (Line 2: s1 p1 f1 s2 p2 f2 ... sm pm fm)
-                page_line = file.readline().strip().split()
-                for i in range(0, len(page_line), 3):
-                    s = int(page_line[i])      # segment number
-                    p = int(page_line[i + 1])  # page number
-                    frame = int(page_line[i + 2])  # frame/block number
-                    
-                    if self.PM[2 * s + 1] > 0:  # If PT is resident
-                        # Set page frame in PT: PM[PT_base + p] = frame
-                        pt_base = self.PM[2 * s + 1] * 512
-                        self.PM[pt_base + p] = frame
-                        if frame > 0:  # Page is in memory
-                            self.used_frames.add(frame)
-                            self.highest_frame = max(self.highest_frame, frame)
-                    else:  # PT is on disk
-                        # Store in disk: D[|PT_block|][p] = frame
-                        disk_block = abs(self.PM[2 * s + 1])
-                        self.DISK[disk_block][p] = frame
-                        if frame > 0:  # Track highest frame even if on disk
-                            self.highest_frame = max(self.highest_frame, frame)
+                # Read segment table entries (Line 1: s1 z1 f1 s2 z2 f2 ... sn zn fn), one row per triple
+                st = np.fromstring(file.readline().strip(), dtype=np.int64, sep=' ').reshape(-1, 3)
+                s, z, frame = st[:, 0], st[:, 1], st[:, 2]  # segment numbers, sizes, frame/block numbers
+
+                # Set segment size in ST: PM[2s] = z
+                self.PM[2 * s] = z
+                # Set PT location in ST: PM[2s+1] = frame
+                self.PM[2 * s + 1] = frame
+
+                pt_frames = frame[frame > 0]  # PTs in memory
+                self.used_mask[pt_frames] = True
+                self.highest_frame = max(self.highest_frame, int(pt_frames.max(initial=0)))
+
+                # Read page table entries (Line 2: s1 p1 f1 s2 p2 f2 ... sm pm fm), one row per triple
+                pt = np.fromstring(file.readline().strip(), dtype=np.int64, sep=' ').reshape(-1, 3)
+                s, p, frame = pt[:, 0], pt[:, 1], pt[:, 2]  # segment numbers, page numbers, frame/block numbers
+
+                pt_loc = self.PM[2 * s + 1].astype(np.int64)
+                resident = pt_loc > 0  # Entries whose PT is resident
+                # Set page frame in PT: PM[PT_base + p] = frame
+                self.PM[pt_loc[resident] * 512 + p[resident]] = frame[resident]
+                self.used_mask[frame[resident & (frame > 0)]] = True  # Pages in memory
+                # PT is on disk: D[|PT_block|][p] = frame; pt_loc <= 0 there, so negating is |pt_loc|
+                on_disk = ~resident
+                self.DISK[-pt_loc[on_disk], p[on_disk]] = frame[on_disk]
+                # Track highest frame even if its PT is on disk
+                self.highest_frame = max(self.highest_frame, int(frame.max(initial=0)))
 
                 # Update next_free_frame to be after highest frame seen
                 self.next_free_frame = self.highest_frame + 1
@@ -69,92 +214,131 @@ class VMManager:
 
     def access_frame(self, frame_number):
         """Increment access count for a frame (for LFU)."""
-        if frame_number not in self.frame_access_count:
-            self.frame_access_count[frame_number] = 0
         self.frame_access_count[frame_number] += 1
+        self._push_lfu(frame_number)
+
+    def _push_lfu(self, frame_number):
+        """Record a frame's current access count in the LFU heap."""
+        # Ties break by lowest frame number, as in the kernel's _lfu_victim
+        heapq.heappush(self._lfu_heap, (int(self.frame_access_count[frame_number]), frame_number))
+
+    def _rebuild_lfu_heap(self):
+        """Rebuild the LFU heap from the access counts of all evictable used frames."""
+        frames = np.flatnonzero(self.used_mask[2:]) + 2
+        counts = self.frame_access_count[frames]
+        # Sort by count in numpy; frames are ascending, so a stable sort breaks ties by frame number
+        order = np.argsort(counts, kind='stable')
+        # A list sorted by (count, frame) already satisfies the heap invariant, so no heapify is needed
+        self._lfu_heap = list(zip(counts[order].tolist(), frames[order].tolist()))
+        self._lfu_heap_stale = False
 
     def evict_lfu_frame(self):
         """Evict the least-frequently-used frame and return its number."""
-        # Exclude reserved frames from eviction
-        candidate_frames = self.used_frames - {0, 1}
-        if not candidate_frames:
+        if self._lfu_heap_stale:
+            self._rebuild_lfu_heap()
+        # Pop until an entry still matches a used frame's current count
+        while self._lfu_heap:
+            count, lfu_frame = heapq.heappop(self._lfu_heap)
+            if lfu_frame > 1 and self.used_mask[lfu_frame] and count == self.frame_access_count[lfu_frame]:
+                break
+        else:
             return None  # No frame to evict
-        lfu_frame = min(candidate_frames, key=lambda f: self.frame_access_count.get(f, 0))
-        self.used_frames.remove(lfu_frame)
-        if lfu_frame in self.frame_access_count:
-            del self.frame_access_count[lfu_frame]
+        self.used_mask[lfu_frame] = False
+        self.frame_access_count[lfu_frame] = 0
         return lfu_frame
 
     def translate_address(self, va):
         """Translate virtual address to physical address."""
-        # Extract s, p, w from VA (each 9 bits)
-        w = va & 0x1FF          # Last 9 bits
-        p = (va >> 9) & 0x1FF   # Middle 9 bits
-        s = (va >> 18) & 0x1FF  # First 9 bits
-        pw = va & 0x3FFFF       # Last 18 bits (p and w combined)
+        pa = self.translate_addresses(np.array([va], dtype=np.int64))[0]
+        return int(pa) if pa >= 0 else None  # -1 marks a fault
 
-        # Check if segment exists and if VA is within segment bounds
-        if s * 2 >= len(self.PM) or self.PM[2 * s] == 0:
-            return None  # Segment fault
-        if pw >= self.PM[2 * s]:
-            return None  # Offset beyond segment size
-
-        # Get PT location from ST
-        pt_loc = self.PM[2 * s + 1]
-        # If PT is not resident (negative frame number)
-        if pt_loc < 0:
-            pt_loc = self.handle_page_fault(s, None, is_pt=True)
-            if pt_loc is None:
-                return None
-        self.access_frame(pt_loc)  # Access PT frame
-
-        # Get page frame from PT
-        page_frame = self.PM[pt_loc * 512 + p]
-        # If page is not resident (negative frame number)
-        if page_frame < 0:
-            page_frame = self.handle_page_fault(s, p, is_pt=False)
-            if page_frame is None:
-                return None
-        self.access_frame(page_frame)  # Access page frame
+    def translate_addresses(self, vas):
+        """Translate an int64 array of virtual addresses. Returns physical addresses, -1 for faults."""
+        if JIT_AVAILABLE:
+            pas, self.next_free_frame, self._translations = _translate_batch(
+                self.PM, self.DISK.reshape(-1), vas, self.used_mask, self.frame_access_count,
+                self.next_free_frame, self.highest_frame, self._translations, True)
+        else:
+            pas = self._translate_interpreted(vas)
+        self._lfu_heap_stale = True  # The kernel bumps and ages counts without touching the heap
+        return pas
 
-        # Calculate final physical address
-        return page_frame * 512 + w
+    def _translate_interpreted(self, vas):
+        """Run the kernel as plain Python in slices that end at LFU aging points, aging in numpy between them."""
+        # Interpreted, memoryview indexing yields plain ints instead of boxed numpy scalars
+        PM, DISK, vas_view, used_mask, access_count = map(
+            memoryview, (self.PM, self.DISK.reshape(-1), vas, self.used_mask, self.frame_access_count))
+        if self._translations % LFU_AGING_INTERVAL + len(vas) < LFU_AGING_INTERVAL:
+            # No aging point falls inside the stream, as for 255 of every 256 single addresses: run the kernel once
+            pas, self.next_free_frame, self._translations = _translate_batch(
+                PM, DISK, vas_view, used_mask, access_count,
+                self.next_free_frame, self.highest_frame, self._translations, False)
+            return pas
+        pieces = []
+        start = 0
+        while start < len(vas):
+            # Counts are halved just before each translation numbered a multiple of the interval
+            into_interval = self._translations % LFU_AGING_INTERVAL
+            if into_interval == LFU_AGING_INTERVAL - 1:
+                self.frame_access_count >>= 1
+                into_interval = -1
+            end = min(len(vas), start + LFU_AGING_INTERVAL - 1 - into_interval)
+            piece, self.next_free_frame, self._translations = _translate_batch(
+                PM, DISK, vas_view[start:end], used_mask, access_count,
+                self.next_free_frame, self.highest_frame, self._translations, False)
+            pieces.append(piece)
+            start = end
+        return np.concatenate(pieces) if pieces else np.empty(0, dtype=np.int64)
 
     def handle_page_fault(self, segment, page, is_pt=False):
         """Handle a page fault for a page table or a page. Returns the frame number used, or None if failed."""
-        # Try to get a free frame
-        if len(self.used_frames) < 1024:
-            frame = self.get_next_free_frame()
-        else:
-            frame = self.evict_lfu_frame()
-            if frame is None:
-                return None
-        # Simulate loading from disk
+        frame, self.next_free_frame = _claim_frame(
+            self.used_mask, self.frame_access_count, self.next_free_frame, self.highest_frame)
+        frame = int(frame)
+        if frame < 0:
+            return None
+        self._lfu_heap_stale = True  # The claim may evict a frame and reset its count
         if is_pt:
-            # Loading a page table
-            pt_disk_block = abs(self.PM[2 * segment + 1])
-            # In a real system, copy PT from disk to frame
+            # Loading a page table: copy it from its disk block into the frame in one slice
+            pt_disk_block = abs(int(self.PM[2 * segment + 1]))
+            self.PM[frame * 512:frame * 512 + 512] = self.DISK[pt_disk_block]
             self.PM[2 * segment + 1] = frame  # Update ST to point to new PT frame
         else:
-            # Loading a page
-            pt_loc = self.PM[2 * segment + 1]
-            disk_block = abs(self.PM[pt_loc * 512 + page])
-            # In a real system, copy page from disk to frame
+            # Loading a page; page contents are simulated
+            pt_loc = int(self.PM[2 * segment + 1])
             self.PM[pt_loc * 512 + page] = frame  # Update PT to point to new page frame
         return frame
 
     def process_addresses(self, input_file, output_file):
         """Process virtual addresses from input file and write results to output file."""
         with open(input_file, 'r') as fin, open(output_file, 'w') as fout:
-            vas = fin.readline().strip().split()
-            results = []
-            for va in vas:
-                pa = self.translate_address(int(va))
-                if pa is not None:
-                    results.append(str(pa))
-                else:
-                    results.append("-1")
-            fout.write(" ".join(results))
+            # Tokenize and parse the VA line in C straight into an int64 array
+            vas = np.fromstring(fin.readline().strip(), dtype=np.int64, sep=' ')
+            pas = self.translate_addresses(vas)
+            # Format every PA in a single C-level %-format call instead of one str() per VA
+            fout.write(("%d " * len(pas))[:-1] % tuple(pas.tolist()))
+
+    def _find_free_run(self, start, num_frames):
+        """Return the first frame >= start that begins num_frames consecutive free frames, or -1."""
+        if start > 1024 - num_frames:
+            return -1
+        if num_frames == 0:
+            return start
+        # Run-length encode the free frames from start on: edges of the zero-padded mask bound each run
+        free = np.zeros(1026 - start, dtype=np.int8)
+        free[1:-1] = ~self.used_mask[start:]
+        edges = np.flatnonzero(np.diff(free))
+        run_starts, run_ends = edges[0::2], edges[1::2]
+        fits = np.flatnonzero(run_ends - run_starts >= num_frames)
+        return start + int(run_starts[fits[0]]) if fits.size else -1
+
+    def _free_run_around(self, frame):
+        """Return (first, end) bounding the run of free frames that contains frame."""
+        used_after = np.flatnonzero(self.used_mask[frame + 1:])
+        end = frame + 1 + int(used_after[0]) if used_after.size else 1024
+        used_before = np.flatnonzero(self.used_mask[:frame])
+        first = int(used_before[-1]) + 1 if used_before.size else 0
+        return first, end
 
     def malloc(self, size):
         """
@@ -165,52 +349,49 @@ class VMManager:
         If sufficient contiguous frames are not available, malloc will fail even if enough total free frames exist.
         This design choice simplifies the allocator but may cause fragmentation and allocation failures under heavy use.
         """
-        import math
         FRAME_SIZE = 512
         MAX_FRAMES = 1024
-        num_frames = math.ceil(size / FRAME_SIZE)
+        num_frames = int(-(-size // FRAME_SIZE))  # Ceiling division; int() also covers float sizes
+        # Search for a block of num_frames consecutive free frames
+        cur_frame = self._find_free_run(self.next_free_frame, num_frames)
         attempts = 0
-        while attempts <= MAX_FRAMES:
-            # Search for a block of num_frames consecutive free frames
-            cur_frame = self.next_free_frame
-            while cur_frame <= MAX_FRAMES - num_frames:
-                block_free = True
-                for offset in range(num_frames):
-                    if (cur_frame + offset) in self.used_frames:
-                        block_free = False
-                        break
-                if block_free:
-                    frame_list = []
-                    for offset in range(num_frames):
-                        frame_num = cur_frame + offset
-                        self.used_frames.add(frame_num)
-                        self.highest_frame = max(self.highest_frame, frame_num)
-                        frame_list.append(frame_num)
-                    next_candidate = cur_frame + num_frames
-                    while next_candidate in self.used_frames and next_candidate < MAX_FRAMES:
-                        next_candidate += 1
-                    self.next_free_frame = next_candidate
-                    start_addr = cur_frame * FRAME_SIZE
-                    self.allocations[start_addr] = (num_frames, frame_list)
-                    return start_addr
-                cur_frame += 1
-            # If we reach here, no contiguous block is available; evict one LFU frame and try again
+        while cur_frame < 0 and attempts <= MAX_FRAMES:
+            # No contiguous block is available; evict one LFU frame and try again
             lfu_frame = self.evict_lfu_frame()
             if lfu_frame is None:
                 break
-            # Remove lfu_frame from any allocation it belonged to
-            to_remove = []
-            for addr, (nframes, frames) in self.allocations.items():
-                if lfu_frame in frames:
-                    frames.remove(lfu_frame)
-                    if not frames:
-                        to_remove.append(addr)
-                    else:
-                        self.allocations[addr] = (len(frames), frames)
-            for addr in to_remove:
-                del self.allocations[addr]
+            # Remove lfu_frame from the allocation it belonged to, if any
+            addr = self._frame_to_alloc.pop(lfu_frame, None)
+            if addr is not None:
+                _, frames = self.allocations[addr]
+                frames.remove(lfu_frame)
+                if frames:
+                    self.allocations[addr] = (len(frames), frames)
+                else:
+                    del self.allocations[addr]
             attempts += 1
-        return -1
+            # Only the free run the evicted frame merged into can have grown, so that is the only one to test
+            first, end = self._free_run_around(lfu_frame)
+            first = max(first, self.next_free_frame)
+            if end - first >= num_frames:
+                cur_frame = first
+        if cur_frame < 0:
+            return -1
+        start_addr = cur_frame * FRAME_SIZE
+        # An allocation left at this address after its first frame was evicted is replaced; unindex its frames
+        for frame_num in self.allocations.get(start_addr, (0, []))[1]:
+            del self._frame_to_alloc[frame_num]
+        frame_list = []
+        for offset in range(num_frames):
+            frame_num = cur_frame + offset
+            self.used_mask[frame_num] = True
+            self._push_lfu(frame_num)
+            self.highest_frame = max(self.highest_frame, frame_num)
+            self._frame_to_alloc[frame_num] = start_addr
+            frame_list.append(frame_num)
+        self.next_free_frame = self._first_free_frame(cur_frame + num_frames)
+        self.allocations[start_addr] = (num_frames, frame_list)
+        return start_addr
 
     def free(self, address) -> bool:
         """Free the memory block starting at the given physical address."""
@@ -218,10 +399,9 @@ class VMManager:
             return False  # Invalid free
         _, frame_list = self.allocations[address]
         for frame in frame_list:
-            if frame in self.used_frames:
-                self.used_frames.remove(frame)
-            if frame in self.frame_access_count:
-                del self.frame_access_count[frame]
+            self.used_mask[frame] = False
+            self.frame_access_count[frame] = 0
+            del self._frame_to_alloc[frame]
         del self.allocations[address]
         
         return True
@@ -230,10 +410,9 @@ class VMManager:
         """Resize the memory block at address to new_size words. Returns new address or -1 if failed."""
         if address not in self.allocations:
             return -1  # Invalid realloc
-        import math
         FRAME_SIZE = 512
         old_num_frames, old_frames = self.allocations[address]
-        new_num_frames = math.ceil(new_size / FRAME_SIZE)
+        new_num_frames = int(-(-new_size // FRAME_SIZE))  # Ceiling division; int() also covers float sizes
         # If new size fits in the same block, do nothing
         if new_num_frames == old_num_frames:
             return address
@@ -241,10 +420,9 @@ class VMManager:
         if new_num_frames < old_num_frames:
             frames_to_free = old_frames[new_num_frames:]
             for frame in frames_to_free:
-                if frame in self.used_frames:
-                    self.used_frames.remove(frame)
-                if frame in self.frame_access_count:
-                    del self.frame_access_count[frame]
+                self.used_mask[frame] = False
+                self.frame_access_count[frame] = 0
+                del self._frame_to_alloc[frame]
             self.allocations[address] = (new_num_frames, old_frames[:new_num_frames])
             return address
         # If growing, try to allocate a new block and copy
@@ -255,10 +433,68 @@ class VMManager:
         self.free(address)
         return new_addr
 
+def _write_eviction_heavy_stream(directory, num_vas=20000, seed=0):
+    """Write an init and input file whose stream faults on PTs and pages and fills PM. Returns both paths."""
+    rng = np.random.default_rng(seed)
+    segments = np.arange(1, 9)  # Eight full-size segments with their PTs on disk blocks 1..8
+    st = np.column_stack((segments, np.full(8, 512 * 512), -segments))
+    # Every page starts on a disk block, so 4096 pages compete for 1022 frames
+    s, p = np.repeat(segments, 512), np.tile(np.arange(512), 8)
+    pt = np.column_stack((s, p, -rng.integers(9, 1024, s.size)))
+    # Mostly valid VAs, plus some in segments 9..15, which do not exist
+    vas = (rng.integers(1, 16, num_vas) << 18) + rng.integers(0, 512 * 512, num_vas)
+    init_file, input_file = os.path.join(directory, "init.txt"), os.path.join(directory, "input.txt")
+    with open(init_file, 'w') as f:
+        f.write(" ".join(map(str, st.ravel().tolist())) + "\n" + " ".join(map(str, pt.ravel().tolist())))
+    with open(input_file, 'w') as f:
+        f.write(" ".join(map(str, vas.tolist())))
+    return init_file, input_file
+
+
+def _kernel_state(init_file, input_file):
+    """Translate input_file's VA stream after init_file. Returns the PAs and the state the kernel mutates."""
+    vm = VMManager()
+    vm.initialize_from_file(init_file)
+    with open(input_file, 'r') as fin:
+        vas = np.fromstring(fin.readline().strip(), dtype=np.int64, sep=' ')
+    pas = vm.translate_addresses(vas)
+    return {"pas": pas, "PM": vm.PM, "used_mask": vm.used_mask, "frame_access_count": vm.frame_access_count}
+
+
+def check_kernels(init_file=None, input_file=None):
+    """Check that the compiled and interpreted kernels leave identical results on one stream.
+
+    The interpreted run happens in a child process with numba hidden, so both sides run the module as
+    shipped. Without files, a generated fault- and eviction-heavy stream is used. Returns the names of
+    the mismatched results, an empty list if everything matches.
+    """
+    if not JIT_AVAILABLE:
+        raise RuntimeError("numba is not installed, so there is no compiled kernel to check against")
+    with tempfile.TemporaryDirectory() as directory:
+        if init_file is None:
+            init_file, input_file = _write_eviction_heavy_stream(directory)
+        init_file, input_file = os.path.abspath(init_file), os.path.abspath(input_file)
+        interpreted_file = os.path.join(directory, "interpreted.npz")
+        module_dir, module_file = os.path.split(os.path.abspath(__file__))
+        child = ("import sys; sys.modules['numba'] = None; sys.path.insert(0, sys.argv[1]); import numpy as np; "
+                 "vm = __import__(sys.argv[2]); np.savez(sys.argv[5], **vm._kernel_state(sys.argv[3], sys.argv[4]))")
+        subprocess.run([sys.executable, "-c", child, module_dir, os.path.splitext(module_file)[0],
+                        init_file, input_file, interpreted_file], check=True)
+        compiled = _kernel_state(init_file, input_file)
+        with np.load(interpreted_file) as interpreted:
+            return [name for name, value in compiled.items() if not np.array_equal(value, interpreted[name])]
+
+
 def main():
     vm = VMManager()
     vm.initialize_from_file("init-dp.txt")
     vm.process_addresses("input-dp.txt", "output.txt")
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["--check-kernels"]:
+        # python virtual_memory.py --check-kernels [init_file input_file]
+        mismatched = check_kernels(*sys.argv[2:4])
+        print("compiled and interpreted kernels differ in: " + ", ".join(mismatched) if mismatched
+              else "compiled and interpreted kernels agree")
+        sys.exit(1 if mismatched else 0)
     main()